@@ -1,13 +1,18 @@
 import streamlit as st
+import asyncio
 import os
-from openai import OpenAI
-import tempfile
+import string
+import time
+import httpx
+from openai import OpenAI, AsyncOpenAI, APIError
+from openai.types.beta import VectorStoreFileBatch
 from dotenv import load_dotenv
 import logging
-from typing import List, Tuple, Optional, IO, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Callable, List, Tuple, Optional, IO, Union
 from assistant_instructions import get_assistant_instructions
 from messages import MESSAGES, PHASE_NAMES, PITCH_DECK_MESSAGES, PITCH_DECK_PHASE_NAMES  # Import MESSAGES and PHASE_NAMES
-from streamlit_modal import Modal
 
 # Load environment variables and set up logging
 load_dotenv()
@@ -15,7 +20,15 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize OpenAI client with API key from .env
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+@st.cache_resource
+def get_client() -> OpenAI:
+    """Share one OpenAI client (and its HTTP/2 connection pool) across sessions"""
+    return OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.Client(http2=True, limits=httpx.Limits(max_connections=100)),
+    )
+
+client = get_client()
 
 # Streamlit app configuration
 st.set_page_config(page_title="OpenAI Assistant Manager", layout="wide")
@@ -24,11 +37,11 @@ st.set_page_config(page_title="OpenAI Assistant Manager", layout="wide")
 if 'vector_store' not in st.session_state:
     st.session_state['vector_store'] = None
 if 'assistants' not in st.session_state:
-    st.session_state['assistants'] = []
+    st.session_state['assistants'] = {}  # keyed by assistant id for O(1) lookup
 if 'chat_history' not in st.session_state:
     st.session_state['chat_history'] = []
 if 'refresh_files' not in st.session_state:
-    st.session_state['refresh_files'] = False
+    st.session_state['refresh_files'] = 0
 if 'assistant' not in st.session_state:
     st.session_state['assistant'] = None
 if 'message_index' not in st.session_state:
@@ -37,6 +50,15 @@ if 'conversation_history' not in st.session_state:
     st.session_state['conversation_history'] = []
 if 'assistant_chat_histories' not in st.session_state:
     st.session_state['assistant_chat_histories'] = {}
+if 'response_cache' not in st.session_state:
+    st.session_state['response_cache'] = {}
+if '_assistant_index' not in st.session_state:
+    st.session_state['_assistant_index'] = {}
+if '_assistant_options' not in st.session_state:
+    st.session_state['_assistant_options'] = []
+
+# Maximum in-flight file uploads to OpenAI
+UPLOAD_CONCURRENCY = 8
 
 # Update this constant to use relative paths
 GRANT_ASSISTANT_REQUIRED_FILES = [
@@ -51,46 +73,105 @@ PITCH_DECK_CREATOR_REQUIRED_FILES = [
     "required_files/VB AI pitchdeck.pdf"
 ]
 
+# Only prefetch files big enough for a cold read to matter
+PREFETCH_MIN_BYTES = 1 << 20
+
+@st.cache_resource
+def prefetch_required_files() -> bool:
+    """Warm the page cache for large required files with parallel reads
+
+    The uploader streams these from disk; on cold or networked storage the
+    first read of each file would otherwise serialize into the upload path.
+    Runs once per process thanks to st.cache_resource.
+    """
+    paths = [p for p in GRANT_ASSISTANT_REQUIRED_FILES + PITCH_DECK_CREATOR_REQUIRED_FILES
+             if os.path.isfile(p) and os.path.getsize(p) >= PREFETCH_MIN_BYTES]
+    if paths:
+        def read_through(path):
+            with open(path, "rb") as f:
+                while f.read(1 << 20):
+                    pass
+
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            list(executor.map(read_through, paths))
+    return True
+
+@st.cache_data
+def get_assistant_types() -> List[str]:
+    """List the available assistant types once instead of on every rerun"""
+    return list(get_assistant_instructions("").keys())
+
 def create_vector_store(name: str) -> Optional[dict]:
     """Create a new vector store"""
     try:
         vector_store = client.beta.vector_stores.create(name=name)
-        logger.info(f"Vector store '{name}' created successfully")
+        logger.info("Vector store '%s' created successfully", name)
         return vector_store
     except Exception as e:
-        logger.error(f"Error creating vector store: {str(e)}")
+        logger.error("Error creating vector store: %s", e)
         st.error(f"Error creating vector store: {str(e)}")
         return None
 
-def upload_files_to_vector_store(vector_store_id: str, files: List[Union[IO, Tuple[str, Tuple[str, bytes]]]]) -> Optional[List[dict]]:
-    """Upload files to the vector store"""
+def upload_files_to_vector_store(vector_store_id: str, files: List[Union[IO, Tuple[str, Tuple[str, IO]]]],
+                                 progress: Optional[Callable[[str], None]] = None) -> Optional[VectorStoreFileBatch]:
+    """Upload files to the vector store as a single batch"""
     try:
-        uploaded_files = []
-        with tempfile.TemporaryDirectory() as temp_dir:
-            for file in files:
-                if isinstance(file, tuple):  # For required files
-                    _, (filename, content) = file
-                    file_path = os.path.join(temp_dir, filename)
-                    with open(file_path, "wb") as f:
-                        f.write(content)
-                else:  # For uploaded files
-                    file_path = os.path.join(temp_dir, file.name)
-                    with open(file_path, "wb") as f:
-                        f.write(file.getbuffer())
-
-                with open(file_path, "rb") as f:
-                    file_batch = client.beta.vector_stores.file_batches.upload_and_poll(
-                        vector_store_id=vector_store_id, files=[f]
-                    )
-                uploaded_files.append(file_batch)
-                logger.info(f"File {os.path.basename(file_path)} uploaded successfully to vector store {vector_store_id}")
-
-        return uploaded_files
+        batch_files = []
+        for file in files:
+            if isinstance(file, tuple):  # For required files (name, handle)
+                _, (filename, content) = file
+            else:  # For uploaded files: pass the file object itself so the
+                   # multipart encoder reads it in chunks instead of holding
+                   # a second full copy of the bytes
+                file.seek(0)
+                filename, content = file.name, file
+            batch_files.append((filename, content))
+
+        # Uploads are I/O-bound and independent, so run them concurrently on
+        # the async client before attaching everything to the store as one
+        # batch; progress (if given) is ticked as each file finishes. The
+        # semaphore keeps large selections from opening unbounded connections.
+        # The async client is created per call: each upload runs in its own
+        # asyncio.run loop, so a cached client would keep connections bound to
+        # an already-closed loop. Construction is cheap and the semaphore
+        # still bounds how many connections get opened.
+        async def upload_all():
+            async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) as aclient:
+                semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+                async def upload_one(batch_file):
+                    async with semaphore:
+                        uploaded = await aclient.files.create(file=batch_file, purpose="assistants")
+                    if progress:
+                        progress(batch_file[0])
+                    return uploaded
+
+                return await asyncio.gather(*(upload_one(bf) for bf in batch_files))
+
+        uploaded = asyncio.run(upload_all())
+
+        file_batch = client.beta.vector_stores.file_batches.create_and_poll(
+            vector_store_id=vector_store_id, file_ids=[f.id for f in uploaded]
+        )
+        logger.info("Uploaded %d file(s) to vector store %s in one batch", len(batch_files), vector_store_id)
+        return file_batch
     except Exception as e:
-        logger.error(f"Error uploading files: {str(e)}")
+        logger.error("Error uploading files: %s", e)
         st.error(f"Error uploading files: {str(e)}")
         return None
 
+def rebuild_assistant_index():
+    """Rebuild the selectbox options and name lookup after the assistants change
+
+    Doing this once per mutation keeps the per-rerun sidebar work to plain
+    session-state reads instead of N label builds and a linear scan. The
+    index is keyed by the full selectbox label so the metadata chain behind
+    each label is resolved here, never during a rerun.
+    """
+    index = {f"{a.metadata.get('type', 'Unknown')} - {a.name}": a for a in st.session_state['assistants'].values()}
+    st.session_state['_assistant_index'] = index
+    st.session_state['_assistant_options'] = list(index)
+
 def create_assistant(name: str, assistant_type: str, vector_store_id: str) -> Optional[dict]:
     """Create a new OpenAI assistant"""
     try:
@@ -100,46 +181,113 @@ def create_assistant(name: str, assistant_type: str, vector_store_id: str) -> Op
             instructions=instructions,
             model="gpt-4o",
             tools=[{"type": "file_search"}],
-            metadata={"type": assistant_type}
-        )
-        assistant = client.beta.assistants.update(
-            assistant_id=assistant.id,
             tool_resources={"file_search": {"vector_store_ids": [vector_store_id]}},
+            metadata={"type": assistant_type}
         )
-        st.session_state['assistants'].append(assistant)
-        logger.info(f"Assistant '{name}' created successfully")
+        st.session_state['assistants'][assistant.id] = assistant
+        rebuild_assistant_index()
+        logger.info("Assistant '%s' created successfully", name)
         return assistant
     except Exception as e:
-        logger.error(f"Error creating assistant: {str(e)}")
+        logger.error("Error creating assistant: %s", e)
         st.error(f"Error creating assistant: {str(e)}")
         return None
 
-def chat_with_assistant(assistant_id: str, user_message: str) -> Optional[str]:
+# Statuses after which a run will never make further progress
+RUN_TERMINAL_STATUSES = {"completed", "failed", "cancelled", "expired", "requires_action"}
+
+# Cached responses expire after an hour so repeated prompts can't return stale answers
+RESPONSE_CACHE_TTL = 3600
+
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
+def normalize_message(message: str) -> str:
+    """Normalize a message for response cache lookups"""
+    return " ".join(message.lower().translate(_PUNCTUATION_TABLE).split())
+
+def wait_for_run(thread_id: str, run_id: str):
+    """Poll a run with exponential backoff until it reaches a terminal status"""
+    iteration = 0
+    while True:
+        run = client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run_id)
+        if run.status in RUN_TERMINAL_STATUSES:
+            return run
+        time.sleep(min(2.0, 0.25 * 1.5 ** iteration))
+        iteration += 1
+
+def get_assistant_thread_id(assistant_id: str) -> str:
+    """Get (or lazily create) the persistent thread for an assistant
+
+    Each assistant keeps one long-lived thread so the backend can reuse the
+    cached prompt prefix for its long instructions across turns and resets.
+    """
+    chat = st.session_state['assistant_chat_histories'].setdefault(assistant_id, {
+        'chat_history': [],
+        'conversation_history': [],
+        'message_index': 0,
+        'company_name': '',
+        'selected_slides': '',
+        'draft_answer_count': 1  # The initial Draft Answer Generation phase counts as 1
+    })
+    if not chat.get('thread_id'):
+        chat['thread_id'] = client.beta.threads.create().id
+    return chat['thread_id']
+
+def chat_with_assistant(assistant_id: str, user_message: str, no_cache: bool = False) -> Optional[str]:
     """Chat with the selected assistant"""
     try:
-        if 'thread_id' not in st.session_state:
-            thread = client.beta.threads.create()
-            st.session_state['thread_id'] = thread.id
-        
+        thread_id = get_assistant_thread_id(assistant_id)
+
+        # Many prompts in this workflow are repeated verbatim; answer those
+        # from the cache instead of paying for another run. Phase-transition
+        # messages pass no_cache=True because repeats expect fresh output.
+        cache_key = (thread_id, normalize_message(user_message))
+        if not no_cache:
+            cached = st.session_state['response_cache'].get(cache_key)
+            if cached and time.time() - cached[0] < RESPONSE_CACHE_TTL:
+                logger.info("Returning cached response for repeated message")
+                return cached[1]
+
         client.beta.threads.messages.create(
-            thread_id=st.session_state['thread_id'],
+            thread_id=thread_id,
             role="user",
             content=user_message
         )
-        run = client.beta.threads.runs.create(
-            thread_id=st.session_state['thread_id'],
-            assistant_id=assistant_id
-        )
-        
-        # Wait for the run to complete
-        while run.status != "completed":
-            run = client.beta.threads.runs.retrieve(thread_id=st.session_state['thread_id'], run_id=run.id)
-        
-        # Retrieve messages
-        messages = client.beta.threads.messages.list(thread_id=st.session_state['thread_id'])
-        return messages.data[0].content[0].text.value
+        # Stream the run over a persistent SSE connection instead of polling
+        # runs.retrieve in a loop (one HTTPS round-trip per poll)
+        response = None
+        try:
+            with client.beta.threads.runs.stream(
+                thread_id=thread_id,
+                assistant_id=assistant_id
+            ) as stream:
+                stream.until_done()
+                final_messages = stream.get_final_messages()
+
+            if final_messages:
+                response = final_messages[-1].content[0].text.value
+        except APIError as e:
+            # Streaming unavailable (e.g. upgrade refused): fall back to
+            # polling with backoff instead of failing the turn
+            logger.warning("Streaming failed (%s), falling back to polling", e)
+            run = client.beta.threads.runs.create(
+                thread_id=thread_id,
+                assistant_id=assistant_id
+            )
+            run = wait_for_run(thread_id, run.id)
+            if run.status != "completed":
+                st.error(f"Assistant run ended with status '{run.status}'")
+                return None
+
+        if response is None:
+            # Fall back to fetching the latest message if the stream yielded none
+            messages = client.beta.threads.messages.list(thread_id=thread_id)
+            response = messages.data[0].content[0].text.value
+
+        st.session_state['response_cache'][cache_key] = (time.time(), response)
+        return response
     except Exception as e:
-        logger.error(f"Error chatting with assistant: {str(e)}")
+        logger.error("Error chatting with assistant: %s", e)
         st.error(f"Error chatting with assistant: {str(e)}")
         return None
 
@@ -147,26 +295,56 @@ def list_vector_store_files(vector_store_id: str) -> Optional[List[Tuple[str, st
     """List files in the vector store"""
     try:
         vector_store_files = client.beta.vector_stores.files.list(vector_store_id=vector_store_id)
-        return [(file.id, str(file)) for file in vector_store_files.data] if vector_store_files else None
+        # Avoid str(file): repr'ing the pydantic model serializes every field
+        # when the UI only needs an identifying label
+        return [(file.id, getattr(file, 'filename', None) or file.id) for file in vector_store_files.data] if vector_store_files else None
     except Exception as e:
-        logger.error(f'Error listing vector store files: {str(e)}')
+        logger.error('Error listing vector store files: %s', e)
         st.error(f'Error listing vector store files: {str(e)}')
         return None
 
+@st.cache_data(ttl=60)
+def cached_vector_store_files(vector_store_id: str, refresh_token: int) -> Optional[List[Tuple[str, str]]]:
+    """Memoized file listing; bumping refresh_token busts the cache after mutations
+
+    The token only ever increases so two mutations inside the ttl window can
+    never land back on a previously cached key.
+    """
+    return list_vector_store_files(vector_store_id)
+
+# How long a retrieved vector store object stays fresh in session state
+VECTOR_STORE_TTL = 300
+
+def get_vector_store(vector_store_id: str):
+    """Retrieve a vector store, reusing a session-cached copy for a few minutes"""
+    cached = st.session_state.get(f'vs_{vector_store_id}')
+    if cached and time.time() - cached[0] < VECTOR_STORE_TTL:
+        return cached[1]
+    vector_store = client.beta.vector_stores.retrieve(vector_store_id)
+    st.session_state[f'vs_{vector_store_id}'] = (time.time(), vector_store)
+    return vector_store
+
+def invalidate_vector_store(vector_store_id: str):
+    """Drop the cached copy after an upload or delete changes the store"""
+    st.session_state.pop(f'vs_{vector_store_id}', None)
+
 def delete_vector_store_file(vector_store_id: str, file_id: str) -> Optional[dict]:
-    """Delete a file from the vector store"""
+    """Delete a file from the vector store
+
+    Runs on executor worker threads, which have no ScriptRunContext, so
+    failures are only logged and returned as None; the caller reports them
+    to the UI from the main thread.
+    """
     try:
         deleted_file = client.beta.vector_stores.files.delete(
             vector_store_id=vector_store_id,
             file_id=file_id
         )
         if deleted_file:
-            st.session_state['refresh_files'] = True
-            logger.info(f"File {file_id} deleted successfully from vector store {vector_store_id}")
+            logger.info("File %s deleted successfully from vector store %s", file_id, vector_store_id)
         return deleted_file
     except Exception as e:
-        logger.error(f'Error deleting file: {str(e)}')
-        st.error(f'Error deleting file: {str(e)}')
+        logger.error('Error deleting file: %s', e)
         return None
 
 def display_tabs(conversation_history):
@@ -183,7 +361,7 @@ def display_tabs(conversation_history):
                     if st.button("Analyze Additional Files", key=f"analyze_additional_{i}"):
                         message = "I have uploaded additional files. Please analyze them, absorb their information and regenerate your information sufficiency analysis."
                         with st.spinner("Assistant is analyzing additional files..."):
-                            response = chat_with_assistant(st.session_state['assistant'].id, message)
+                            response = chat_with_assistant(st.session_state['assistant'].id, message, no_cache=True)
                         if response:
                             conversation_history[i] = (phase_name, response)
                             st.rerun()
@@ -209,47 +387,198 @@ def display_tabs(conversation_history):
                     with col2:
                         if st.button("Next Question", key=f"next_question_{i}"):
                             next_message = "Next question please"
+                            assistant_id = st.session_state['assistant'].id
                             with st.spinner("Assistant is preparing the next draft answer..."):
-                                response = chat_with_assistant(st.session_state['assistant'].id, next_message)
+                                response = chat_with_assistant(assistant_id, next_message, no_cache=True)
                             if response:
-                                new_draft_answer_count = len([p for p in conversation_history if p[0].startswith("Draft Answer Generation")]) + 1
-                                new_phase_name = f"Draft Answer Generation {new_draft_answer_count}"
+                                current_chat = st.session_state['assistant_chat_histories'][assistant_id]
+                                current_chat['draft_answer_count'] = current_chat.get('draft_answer_count', 1) + 1
+                                new_phase_name = f"Draft Answer Generation {current_chat['draft_answer_count']}"
                                 conversation_history.append((new_phase_name, response))
                                 st.rerun()
                     
                     if st.button("Show me all the questions", key=f"show_all_questions_{i}"):
                         show_questions_message = "Amazing! Please show me all the draft answers that have been generated so far."
                         with st.spinner("Assistant is retrieving all questions..."):
-                            response = chat_with_assistant(st.session_state['assistant'].id, show_questions_message)
+                            response = chat_with_assistant(st.session_state['assistant'].id, show_questions_message, no_cache=True)
                         if response:
                             new_phase_name = "All Questions Summary"
                             conversation_history.append((new_phase_name, response))
                             st.rerun()
 
+def _handle_business_report(i, phase, current_chat, messages, phase_names, assistant_id):
+    """Interactive controls for the Business Report Generation phase"""
+    if i == len(current_chat['conversation_history']) - 1:  # If this is the last phase in the history
+        if st.button("Next Phase", key=f"next_phase_{i}"):
+            if current_chat['message_index'] < len(messages):
+                message = messages[current_chat['message_index']]
+                with st.spinner("Assistant is preparing the next phase..."):
+                    response = chat_with_assistant(assistant_id, message, no_cache=True)
+                if response:
+                    phase_name = phase_names[current_chat['message_index']]
+                    current_chat['conversation_history'].append((phase_name, response))
+                    current_chat['message_index'] += 1
+                    st.rerun()
+            else:
+                st.error("All phases have been completed.")
+
+def _handle_slide_suggestion(i, phase, current_chat, messages, phase_names, assistant_id):
+    """Interactive controls for the Slide Suggestion phase"""
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Select All Slides"):
+            current_chat['selected_slides'] = "All slides"
+    with col2:
+        slide_numbers = st.text_input("Or enter specific slide numbers:")
+        if slide_numbers:
+            current_chat['selected_slides'] = slide_numbers
+
+    # Add text box for suggesting additional slides
+    additional_slides = st.text_input("Suggest additional slides:")
+    if st.button("Submit Additional Slides"):
+        if additional_slides:
+            message = f"Please regenerate your list of suggested slides now including these additional slide ideas: {additional_slides}"
+            with st.spinner("Assistant is updating slide suggestions..."):
+                response = chat_with_assistant(assistant_id, message)
+            if response:
+                current_chat['conversation_history'][i] = (phase, response)
+                st.rerun(scope="fragment")
+        else:
+            st.warning("Please enter additional slide suggestions before submitting.")
+
+    if current_chat.get('selected_slides'):
+        st.success(f"Selected slides: {current_chat['selected_slides']}")
+        if st.button("Proceed with Selected Slides"):
+            message = messages[current_chat['message_index']].format(selected_slides=current_chat['selected_slides'])
+            with st.spinner("Assistant is analyzing the selected slides..."):
+                response = chat_with_assistant(assistant_id, message, no_cache=True)
+            if response:
+                current_chat['conversation_history'].append((phase_names[current_chat['message_index']], response))
+                current_chat['message_index'] += 1
+                st.rerun()
+
+def _handle_information_evaluation(i, phase, current_chat, messages, phase_names, assistant_id):
+    """Interactive controls for the Information Evaluation phase"""
+    st.write("---")  # Add a separator for clarity
+    st.subheader("Additional Actions")
+    if st.button("I have uploaded additional information", key=f"upload_info_{i}"):
+        message = "I have just uploaded additional files, please analyze these files and regenerate your formal information gap analysis report, now reflecting the additional information you've extracted from the uploaded files."
+        with st.spinner("Assistant is analyzing new files and updating the report..."):
+            response = chat_with_assistant(assistant_id, message, no_cache=True)
+        if response:
+            current_chat['conversation_history'][i] = (phase, response)
+            st.rerun(scope="fragment")
+
+    # Add text box for user to submit answers to assistant's questions
+    user_answers = st.text_area("Your answers to the assistant's questions:", height=200)
+    if st.button("Submit Answers"):
+        if user_answers:
+            message = f"Here are the answers to the questions you've asked: {user_answers}. Please regenerate your formal information gap analysis report, now reflecting the additional information you've extracted from the answers I've provided."
+            with st.spinner("Assistant is updating the information gap analysis..."):
+                updated_report = chat_with_assistant(assistant_id, message)
+            if updated_report:
+                current_chat['conversation_history'][i] = (phase, updated_report)
+                st.rerun(scope="fragment")
+        else:
+            st.warning("Please provide answers before submitting.")
+
+    # Add "Draft Pitchdeck Slides" button only in the Information Evaluation phase
+    if st.button("Draft Pitchdeck Slides", key="draft_slides_button"):
+        if current_chat['message_index'] < len(messages):
+            message = messages[current_chat['message_index']]
+            with st.spinner("Assistant is drafting pitchdeck slides..."):
+                response = chat_with_assistant(assistant_id, message, no_cache=True)
+            if response:
+                phase_name = phase_names[min(current_chat['message_index'], len(phase_names) - 1)]
+                current_chat['conversation_history'].append((phase_name, response))
+                current_chat['message_index'] += 1
+                st.rerun()
+            else:
+                st.error(f"Failed to get a response from the assistant. Please try again.")
+        else:
+            st.error("All phases have been completed. No more messages to send.")
+
+def _handle_draft_slides(i, phase, current_chat, messages, phase_names, assistant_id):
+    """Interactive controls for the Draft Slide Generation phase"""
+    st.write("---")  # Add a separator for clarity
+    st.subheader("Provide Additional Information")
+    additional_info = st.text_area("Enter additional information for the pitch deck:", height=200)
+    if st.button("Submit Additional Information"):
+        if additional_info:
+            message = f"Here is the additional information you've required, please extract and absorb this information and regenerate the entire content for the pitchdeck, as before, reflecting this new information: {additional_info}"
+            with st.spinner("Assistant is updating the pitch deck content..."):
+                updated_content = chat_with_assistant(assistant_id, message)
+            if updated_content:
+                current_chat['conversation_history'][i] = (phase, updated_content)
+                st.rerun(scope="fragment")
+        else:
+            st.warning("Please provide additional information before submitting.")
+
+    st.write("---")  # Add another separator for clarity
+    st.info("If you have additional files to upload, please use the 'Upload Additional Files' section in the sidebar.")
+    if st.button("Analyze New Files and Regenerate Pitch Deck"):
+        message = "I have just uploaded additional files, please analyze these files and regenerate your Pitch Deck Content, now reflecting the additional information you've extracted from the uploaded files."
+        with st.spinner("Assistant is analyzing new files and updating the pitch deck..."):
+            updated_content = chat_with_assistant(assistant_id, message, no_cache=True)
+        if updated_content:
+            current_chat['conversation_history'][i] = (phase, updated_content)
+            st.rerun(scope="fragment")
+
+# Dispatch table for the Pitch Deck Creator phases with interactive controls;
+# phases without an entry (e.g. Grant Assistant ones) just render their content
+PHASE_HANDLERS = {
+    "1. Business Report Generation": _handle_business_report,
+    "2. Slide Suggestion": _handle_slide_suggestion,
+    "3. Information Evaluation": _handle_information_evaluation,
+    "4. Draft Slide Generation": _handle_draft_slides,
+}
+
+@st.fragment
+def render_phase(i: int, current_chat: dict, messages: List[str], phase_names: List[str], assistant_id: str, assistant_type: str):
+    """Render one phase tab; as a fragment, its widgets rerun only this phase
+
+    Phase and content are re-read from current_chat so in-place regenerations
+    can rerun just this fragment; actions that append a new phase still do a
+    full rerun because they add a tab outside the fragment.
+    """
+    phase, content = current_chat['conversation_history'][i]
+    st.markdown(content)
+
+    # Add phase-specific interactions via a single dict lookup
+    if assistant_type == "Pitch Deck Creator":
+        handler = PHASE_HANDLERS.get(phase)
+        if handler:
+            handler(i, phase, current_chat, messages, phase_names, assistant_id)
+
 def chat_section():
-    if st.session_state['assistant']:
-        assistant_type = st.session_state['assistant'].metadata.get('type', 'Unknown')
-        st.header(f"Chat with {st.session_state['assistant'].name} - {assistant_type}")
+    # Read the selected assistant once; every access below would otherwise go
+    # through the session-state proxy and pydantic attribute resolution
+    assistant = st.session_state['assistant']
+    assistant_type = assistant.metadata.get('type', 'Unknown') if assistant else None
+
+    if assistant:
+        st.header(f"Chat with {assistant.name} - {assistant_type}")
     else:
         st.header("Chat with Assistant")
 
     if st.session_state['assistants']:
-        if st.session_state['assistant']:
-            assistant_id = st.session_state['assistant'].id
+        if assistant:
+            assistant_id = assistant.id
             if assistant_id not in st.session_state['assistant_chat_histories']:
                 st.session_state['assistant_chat_histories'][assistant_id] = {
                     'chat_history': [],
                     'conversation_history': [],
                     'message_index': 0,
                     'company_name': '',
-                    'selected_slides': ''
+                    'selected_slides': '',
+                    'draft_answer_count': 1
                 }
             
             current_chat = st.session_state['assistant_chat_histories'][assistant_id]
 
-            if st.session_state['assistant'].metadata.get('type') in ["Grant Assistant", "Pitch Deck Creator"]:
+            if assistant_type in ["Grant Assistant", "Pitch Deck Creator"]:
                 # Determine which set of messages and phase names to use
-                if st.session_state['assistant'].metadata.get('type') == "Grant Assistant":
+                if assistant_type == "Grant Assistant":
                     messages = MESSAGES
                     phase_names = PHASE_NAMES
                 else:  # Pitch Deck Creator
@@ -267,7 +596,7 @@ def chat_section():
                                 # Send only the first message to the assistant
                                 initial_message = messages[0].format(company_name=company_name)
                                 with st.spinner("Assistant is analyzing the company information..."):
-                                    response = chat_with_assistant(st.session_state['assistant'].id, initial_message)
+                                    response = chat_with_assistant(assistant_id, initial_message, no_cache=True)
                                 if response:
                                     current_chat['conversation_history'].append((phase_names[0], response))
                                     current_chat['message_index'] = 1
@@ -276,130 +605,15 @@ def chat_section():
                                 st.warning("Please enter a company name.")
                         return  # Exit the function to wait for company name input
 
-                # Create tabs for each phase
-                tabs = st.tabs(phase_names[:current_chat['message_index']+1])
+                # Create tabs for each phase, slicing the names once and
+                # bounding the loop so history can never outrun the tabs
+                n = current_chat['message_index'] + 1
+                tabs = st.tabs(phase_names[:n])
+                conversation_history = current_chat['conversation_history']
 
-                for i, (phase, content) in enumerate(current_chat['conversation_history']):
+                for i in range(min(n, len(conversation_history))):
                     with tabs[i]:
-                        st.markdown(content)
-
-                        # Add phase-specific interactions
-                        if phase == "1. Business Report Generation" and st.session_state['assistant'].metadata.get('type') == "Pitch Deck Creator":
-                            if i == len(current_chat['conversation_history']) - 1:  # If this is the last phase in the history
-                                if st.button("Next Phase", key=f"next_phase_{i}"):
-                                    if current_chat['message_index'] < len(messages):
-                                        message = messages[current_chat['message_index']]
-                                        with st.spinner("Assistant is preparing the next phase..."):
-                                            response = chat_with_assistant(st.session_state['assistant'].id, message)
-                                        if response:
-                                            phase_name = phase_names[current_chat['message_index']]
-                                            current_chat['conversation_history'].append((phase_name, response))
-                                            current_chat['message_index'] += 1
-                                            st.rerun()
-                                    else:
-                                        st.error("All phases have been completed.")
-
-                        elif phase == "2. Slide Suggestion" and st.session_state['assistant'].metadata.get('type') == "Pitch Deck Creator":
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                if st.button("Select All Slides"):
-                                    current_chat['selected_slides'] = "All slides"
-                            with col2:
-                                slide_numbers = st.text_input("Or enter specific slide numbers:")
-                                if slide_numbers:
-                                    current_chat['selected_slides'] = slide_numbers
-
-                            # Add text box for suggesting additional slides
-                            additional_slides = st.text_input("Suggest additional slides:")
-                            if st.button("Submit Additional Slides"):
-                                if additional_slides:
-                                    message = f"Please regenerate your list of suggested slides now including these additional slide ideas: {additional_slides}"
-                                    with st.spinner("Assistant is updating slide suggestions..."):
-                                        response = chat_with_assistant(st.session_state['assistant'].id, message)
-                                    if response:
-                                        current_chat['conversation_history'][i] = (phase, response)
-                                        st.rerun()
-                                else:
-                                    st.warning("Please enter additional slide suggestions before submitting.")
-
-                            if current_chat.get('selected_slides'):
-                                st.success(f"Selected slides: {current_chat['selected_slides']}")
-                                if st.button("Proceed with Selected Slides"):
-                                    message = messages[current_chat['message_index']].format(selected_slides=current_chat['selected_slides'])
-                                    with st.spinner("Assistant is analyzing the selected slides..."):
-                                        response = chat_with_assistant(st.session_state['assistant'].id, message)
-                                    if response:
-                                        current_chat['conversation_history'].append((phase_names[current_chat['message_index']], response))
-                                        current_chat['message_index'] += 1
-                                        st.rerun()
-
-                        elif phase == "3. Information Evaluation" and st.session_state['assistant'].metadata.get('type') == "Pitch Deck Creator":
-                            st.write("---")  # Add a separator for clarity
-                            st.subheader("Additional Actions")
-                            if st.button("I have uploaded additional information", key=f"upload_info_{i}"):
-                                message = "I have just uploaded additional files, please analyze these files and regenerate your formal information gap analysis report, now reflecting the additional information you've extracted from the uploaded files."
-                                with st.spinner("Assistant is analyzing new files and updating the report..."):
-                                    response = chat_with_assistant(st.session_state['assistant'].id, message)
-                                if response:
-                                    current_chat['conversation_history'][i] = (phase, response)
-                                    st.rerun()
-
-                            # Add text box for user to submit answers to assistant's questions
-                            user_answers = st.text_area("Your answers to the assistant's questions:", height=200)
-                            if st.button("Submit Answers"):
-                                if user_answers:
-                                    message = f"Here are the answers to the questions you've asked: {user_answers}. Please regenerate your formal information gap analysis report, now reflecting the additional information you've extracted from the answers I've provided."
-                                    with st.spinner("Assistant is updating the information gap analysis..."):
-                                        updated_report = chat_with_assistant(st.session_state['assistant'].id, message)
-                                    if updated_report:
-                                        current_chat['conversation_history'][i] = (phase, updated_report)
-                                        st.rerun()
-                                else:
-                                    st.warning("Please provide answers before submitting.")
-                            
-                            # Add "Draft Pitchdeck Slides" button only in the Information Evaluation phase
-                            if st.button("Draft Pitchdeck Slides", key="draft_slides_button"):
-                                if current_chat['message_index'] < len(messages):
-                                    message = messages[current_chat['message_index']]
-                                    with st.spinner("Assistant is drafting pitchdeck slides..."):
-                                        response = chat_with_assistant(st.session_state['assistant'].id, message)
-                                    if response:
-                                        phase_name = phase_names[min(current_chat['message_index'], len(phase_names) - 1)]
-                                        current_chat['conversation_history'].append((phase_name, response))
-                                        current_chat['message_index'] += 1
-                                        st.rerun()
-                                    else:
-                                        st.error(f"Failed to get a response from the assistant. Please try again.")
-                                else:
-                                    st.error("All phases have been completed. No more messages to send.")
-
-                        elif phase == "4. Draft Slide Generation" and st.session_state['assistant'].metadata.get('type') == "Pitch Deck Creator":
-                            st.write("---")  # Add a separator for clarity
-                            st.subheader("Provide Additional Information")
-                            additional_info = st.text_area("Enter additional information for the pitch deck:", height=200)
-                            if st.button("Submit Additional Information"):
-                                if additional_info:
-                                    message = f"Here is the additional information you've required, please extract and absorb this information and regenerate the entire content for the pitchdeck, as before, reflecting this new information: {additional_info}"
-                                    with st.spinner("Assistant is updating the pitch deck content..."):
-                                        updated_content = chat_with_assistant(st.session_state['assistant'].id, message)
-                                    if updated_content:
-                                        current_chat['conversation_history'][i] = (phase, updated_content)
-                                        st.rerun()
-                                else:
-                                    st.warning("Please provide additional information before submitting.")
-                            
-                            st.write("---")  # Add another separator for clarity
-                            st.info("If you have additional files to upload, please use the 'Upload Additional Files' section in the sidebar.")
-                            if st.button("Analyze New Files and Regenerate Pitch Deck"):
-                                message = "I have just uploaded additional files, please analyze these files and regenerate your Pitch Deck Content, now reflecting the additional information you've extracted from the uploaded files."
-                                with st.spinner("Assistant is analyzing new files and updating the pitch deck..."):
-                                    updated_content = chat_with_assistant(st.session_state['assistant'].id, message)
-                                if updated_content:
-                                    current_chat['conversation_history'][i] = (phase, updated_content)
-                                    st.rerun()
-
-                # Remove the separate "Draft Pitchdeck Slides" button outside the tabs
-                # Remove the "Next Phase" button for Pitch Deck Creator
+                        render_phase(i, current_chat, messages, phase_names, assistant_id, assistant_type)
 
             else:
                 # Original chat functionality for other assistant types
@@ -415,7 +629,7 @@ def chat_section():
                     
                     with st.chat_message("assistant"):
                         message_placeholder = st.empty()
-                        response = chat_with_assistant(st.session_state['assistant'].id, user_message)
+                        response = chat_with_assistant(assistant_id, user_message)
                         if response:
                             message_placeholder.markdown(response)
                             current_chat['chat_history'].append({"role": "assistant", "content": response})
@@ -424,31 +638,51 @@ def chat_section():
     else:
         st.info("Please create an Assistant first.")
 
+def reset_assistant_history(assistant_id: str):
+    """Clear the local history for an assistant while keeping its thread warm
+
+    Deleting the thread would force the backend to re-embed the long system
+    instructions on the next message; instead the thread is kept (so its
+    prompt-prefix cache survives) and a boundary message marks the restart.
+    """
+    histories = st.session_state['assistant_chat_histories']
+    thread_id = histories.get(assistant_id, {}).get('thread_id')
+    histories[assistant_id] = {
+        'chat_history': [],
+        'conversation_history': [],
+        'message_index': 0,
+        'company_name': '',
+        'selected_slides': '',
+        'draft_answer_count': 1,
+        'thread_id': thread_id
+    }
+    if thread_id:
+        # Cached responses predate the reset boundary; serving one afterwards
+        # would skip posting to the thread and desynchronize it from the tabs
+        cache = st.session_state['response_cache']
+        for key in [k for k in cache if k[0] == thread_id]:
+            del cache[key]
+        try:
+            client.beta.threads.messages.create(
+                thread_id=thread_id,
+                role="user",
+                content="[RESET] Disregard the conversation above; we are starting over from the beginning."
+            )
+        except Exception as e:
+            # e.g. a transient failure, or a run still active on the thread;
+            # the local reset stands and the boundary message is just skipped
+            logger.warning("Could not post reset boundary message: %s", e)
+
 def reset_grant_assistant_conversation(assistant_id: str):
     """Reset the Grant Assistant conversation"""
-    if assistant_id in st.session_state['assistant_chat_histories']:
-        st.session_state['assistant_chat_histories'][assistant_id] = {
-            'chat_history': [],
-            'conversation_history': [],
-            'message_index': 0
-        }
-    if 'thread_id' in st.session_state:
-        del st.session_state['thread_id']
+    reset_assistant_history(assistant_id)
     st.success("Conversation has been reset. You can start over from phase 1.")
 
 def reset_chat():
-    """Reset the chat history and thread for the current assistant"""
+    """Reset the chat history for the current assistant"""
     if st.session_state['assistant']:
-        assistant_id = st.session_state['assistant'].id
-        if assistant_id in st.session_state['assistant_chat_histories']:
-            st.session_state['assistant_chat_histories'][assistant_id] = {
-                'chat_history': [],
-                'conversation_history': [],
-                'message_index': 0
-            }
-    if 'thread_id' in st.session_state:
-        del st.session_state['thread_id']
-    st.success("Chat history and thread have been reset for the current assistant.")
+        reset_assistant_history(st.session_state['assistant'].id)
+    st.success("Chat history has been reset for the current assistant.")
 
 def upload_additional_files(vector_store_id: str):
     """Upload additional files to the vector store"""
@@ -456,13 +690,20 @@ def upload_additional_files(vector_store_id: str):
     uploaded_files = st.sidebar.file_uploader("Choose files to upload", accept_multiple_files=True, type=['pdf', 'txt'], key="additional_files")
     if st.sidebar.button("Upload Additional Files"):
         if uploaded_files:
-            file_batch = upload_files_to_vector_store(vector_store_id, uploaded_files)
+            with st.status("Uploading additional files...", expanded=True) as status:
+                file_batch = upload_files_to_vector_store(
+                    vector_store_id, uploaded_files,
+                    progress=lambda name: status.write(f"Uploaded {name}")
+                )
+                status.update(
+                    label="Upload complete" if file_batch else "Upload failed",
+                    state="complete" if file_batch else "error"
+                )
             if file_batch:
                 st.sidebar.success("Additional files uploaded successfully!")
-                st.sidebar.write("File batch status:", file_batch.status)
-                st.sidebar.write("File counts:", file_batch.file_counts)
-                st.session_state['refresh_files'] = True
-                st.rerun()
+                st.sidebar.table([{'status': file_batch.status, **file_batch.file_counts.__dict__}])
+                st.session_state['refresh_files'] += 1
+                invalidate_vector_store(vector_store_id)
         else:
             st.sidebar.warning("Please select files to upload.")
 
@@ -471,130 +712,141 @@ def display_current_ids():
     st.sidebar.markdown("---")
     st.sidebar.subheader("Current Session Info")
     
+    thread_id = None
     if 'assistant' in st.session_state and st.session_state['assistant']:
+        assistant_id = st.session_state['assistant'].id
         st.sidebar.markdown(f"**Assistant ID:**")
-        st.sidebar.code(st.session_state['assistant'].id)
+        st.sidebar.code(assistant_id)
+        thread_id = st.session_state['assistant_chat_histories'].get(assistant_id, {}).get('thread_id')
     else:
         st.sidebar.markdown("**Assistant ID:** Not selected")
-    
-    if 'thread_id' in st.session_state:
+
+    if thread_id:
         st.sidebar.markdown(f"**Thread ID:**")
-        st.sidebar.code(st.session_state['thread_id'])
+        st.sidebar.code(thread_id)
     else:
         st.sidebar.markdown("**Thread ID:** Not created")
 
-def create_assistant_popup():
-    st.write(f"Current working directory: {os.getcwd()}")  # Debug line
-    
-    modal = Modal(key="create_assistant_modal", title="Create Assistant and Upload Files")
-    
-    open_modal = st.sidebar.button("Create New Assistant", key="open_create_assistant_modal")
-    
-    if open_modal:
-        modal.open()
-
-    if modal.is_open():
-        with modal.container():
-            # Step 1: Upload Files
-            uploaded_files = st.file_uploader("Choose files to upload", accept_multiple_files=True, type=['pdf', 'txt'], key="create_assistant_file_uploader")
-            
-            # Step 2: Enter Assistant Name and Select Type
-            assistant_name = st.text_input("Enter Assistant Name (Hint: Name of the company)", key="create_assistant_name")
-            assistant_types = list(get_assistant_instructions("").keys())
-            assistant_type = st.selectbox("Select Assistant Type", assistant_types, key="create_assistant_type")
-            
-            # Step 3: Create Vector Store, Upload Files, and Create Assistant
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Create Assistant", key="create_assistant_button"):
-                    if assistant_name and assistant_type:
-                        with st.spinner("Creating assistant... This may take a few moments."):
-                            # Create Vector Store
-                            vector_store = create_vector_store(assistant_name)
-                            if vector_store:
-                                st.session_state['vector_store'] = vector_store
-                                st.success(f"Vector Store '{assistant_name}' created successfully!")
-                                
-                                # Prepare files for upload
-                                files_to_upload = []
-                                for uploaded_file in uploaded_files:
-                                    files_to_upload.append(uploaded_file)
-                                
-                                # Handle required files based on assistant type
-                                required_files = []
-                                if assistant_type == "Grant Assistant":
-                                    required_files = GRANT_ASSISTANT_REQUIRED_FILES
-                                elif assistant_type == "Pitch Deck Creator":
-                                    required_files = PITCH_DECK_CREATOR_REQUIRED_FILES
-
-                                required_files_found = True
-                                for required_file in required_files:
-                                    full_path = os.path.join(os.getcwd(), required_file)
-                                    st.write(f"Searching for file: {full_path}")  # Debug line
-                                    if os.path.exists(full_path):
-                                        with open(full_path, "rb") as f:
-                                            file_content = f.read()
-                                            files_to_upload.append(("file", (os.path.basename(full_path), file_content)))
-                                        st.success(f"Required file '{os.path.basename(full_path)}' found and added for upload.")
-                                    else:
-                                        st.error(f"Required file '{full_path}' not found.")
-                                        required_files_found = False
-                                
-                                if not required_files_found:
-                                    st.error("Some required files are missing. Please ensure all required files are in the correct directory.")
-                                    return  # Exit the function if required files are missing
-
-                                # Upload Files
-                                if files_to_upload:
-                                    file_batches = upload_files_to_vector_store(vector_store.id, files_to_upload)
-                                    if file_batches:
-                                        st.success("Files uploaded successfully!")
-                                        for i, file_batch in enumerate(file_batches):
-                                            st.write(f"File {i+1} batch status:", file_batch.status)
-                                            st.write(f"File {i+1} counts:", file_batch.file_counts)
-                                        
-                                        # Create Assistant
-                                        assistant = create_assistant(assistant_name, assistant_type, vector_store.id)
-                                        if assistant:
-                                            st.session_state['assistant'] = assistant
-                                            st.success(f"Assistant '{assistant_name}' created successfully!")
-                                            modal.close()
-                                            st.rerun()
-                                    else:
-                                        st.error("Failed to upload files. Assistant creation aborted.")
+@st.dialog("Create Assistant and Upload Files")
+def create_assistant_dialog():
+    # Step 1: Upload Files
+    uploaded_files = st.file_uploader("Choose files to upload", accept_multiple_files=True, type=['pdf', 'txt'], key="create_assistant_file_uploader")
+
+    # Step 2: Enter Assistant Name and Select Type
+    assistant_name = st.text_input("Enter Assistant Name (Hint: Name of the company)", key="create_assistant_name")
+    assistant_types = get_assistant_types()
+    assistant_type = st.selectbox("Select Assistant Type", assistant_types, key="create_assistant_type")
+
+    # Step 3: Create Vector Store, Upload Files, and Create Assistant
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Create Assistant", key="create_assistant_button"):
+            if assistant_name and assistant_type:
+                with st.spinner("Creating assistant... This may take a few moments."):
+                    # Create Vector Store
+                    vector_store = create_vector_store(assistant_name)
+                    if vector_store:
+                        st.session_state['vector_store'] = vector_store
+                        st.success(f"Vector Store '{assistant_name}' created successfully!")
+
+                        # Prepare files for upload
+                        files_to_upload = []
+                        for uploaded_file in uploaded_files:
+                            files_to_upload.append(uploaded_file)
+
+                        # Handle required files based on assistant type
+                        required_files = []
+                        if assistant_type == "Grant Assistant":
+                            required_files = GRANT_ASSISTANT_REQUIRED_FILES
+                        elif assistant_type == "Pitch Deck Creator":
+                            required_files = PITCH_DECK_CREATOR_REQUIRED_FILES
+
+                        # One directory scan replaces a stat syscall (and a
+                        # debug widget) per required file
+                        cwd = os.getcwd()
+                        required_dir = os.path.join(cwd, "required_files")
+                        # is_file() reads the cached dirent type, so directories
+                        # or sockets can't pass the check and fail inside open()
+                        present = {entry.name for entry in os.scandir(required_dir) if entry.is_file()} if os.path.isdir(required_dir) else set()
+
+                        # Open required files as handles so the uploader can
+                        # stream them from disk instead of buffering whole
+                        # PDFs in memory; the stack closes them after upload
+                        with ExitStack() as file_stack:
+                            missing = []
+                            for required_file in required_files:
+                                name = os.path.basename(required_file)
+                                if name in present:
+                                    handle = file_stack.enter_context(open(os.path.join(cwd, required_file), "rb"))
+                                    files_to_upload.append(("file", (name, handle)))
                                 else:
-                                    st.error("No files to upload. Assistant creation aborted.")
-                            else:
-                                st.error("Failed to create Vector Store. Assistant creation aborted.")
+                                    missing.append(required_file)
+
+                            if missing:
+                                st.error(f"Missing required files: {', '.join(missing)}. Please ensure all required files are in the correct directory.")
+                                return  # Exit the function if required files are missing
+
+                            # Upload Files
+                            if not files_to_upload:
+                                st.error("No files to upload. Assistant creation aborted.")
+                                return
+                            file_batch = upload_files_to_vector_store(vector_store.id, files_to_upload)
+
+                        if file_batch:
+                            st.success("Files uploaded successfully!")
+                            st.table([{'status': file_batch.status, **file_batch.file_counts.__dict__}])
+
+                            # Create Assistant
+                            assistant = create_assistant(assistant_name, assistant_type, vector_store.id)
+                            if assistant:
+                                st.session_state['assistant'] = assistant
+                                st.success(f"Assistant '{assistant_name}' created successfully!")
+                                st.rerun()  # Closes the dialog
+                        else:
+                            st.error("Failed to upload files. Assistant creation aborted.")
                     else:
-                        if not assistant_name:
-                            st.warning("Please enter a name for the Assistant.")
-                        if not assistant_type:
-                            st.warning("Please select a type for the Assistant.")
-            
-            with col2:
-                if st.button("Close", key="close_create_assistant_modal"):
-                    modal.close()
+                        st.error("Failed to create Vector Store. Assistant creation aborted.")
+            else:
+                if not assistant_name:
+                    st.warning("Please enter a name for the Assistant.")
+                if not assistant_type:
+                    st.warning("Please select a type for the Assistant.")
 
-def get_assistant_vector_store_id(assistant):
-    """Get the vector store ID associated with the assistant"""
-    if assistant and hasattr(assistant, 'tool_resources'):
-        file_search = assistant.tool_resources.file_search
-        if file_search and file_search.vector_store_ids:
-            return file_search.vector_store_ids[0]
-    return None
+    with col2:
+        if st.button("Close", key="close_create_assistant_modal"):
+            st.rerun()  # Closes the dialog
 
-def main():
-    if 'refresh_files' not in st.session_state:
-        st.session_state['refresh_files'] = False
+def create_assistant_popup():
+    if os.getenv("APP_DEBUG"):
+        st.caption(f"cwd: {os.getcwd()}")
 
-    # Add VB AI logo to the top of the sidebar
+    if st.sidebar.button("Create New Assistant", key="open_create_assistant_modal"):
+        prefetch_required_files()
+        create_assistant_dialog()
+
+def get_assistant_vector_store_id(assistant):
+    """Get the vector store ID associated with the assistant"""
+    tool_resources = getattr(assistant, 'tool_resources', None)
+    file_search = getattr(tool_resources, 'file_search', None) if tool_resources else None
+    vector_store_ids = getattr(file_search, 'vector_store_ids', None) if file_search else None
+    return vector_store_ids[0] if vector_store_ids else None
+
+@st.cache_resource
+def render_sidebar_logo():
+    """Render the static VB AI logo once; cached reruns replay the element"""
     st.sidebar.markdown("""
         <div style='text-align: center; margin-bottom: 20px;'>
             <h1 style='font-size: 3em; font-weight: bold; color: #1E90FF;'>VB AI</h1>
         </div>
     """, unsafe_allow_html=True)
 
+def main():
+    if 'refresh_files' not in st.session_state:
+        st.session_state['refresh_files'] = 0
+
+    # Add VB AI logo to the top of the sidebar
+    render_sidebar_logo()
+
     # Sidebar title
     st.sidebar.title("Assistant Manager")
 
@@ -604,11 +856,9 @@ def main():
     # Move "Select an Assistant" to sidebar
     if st.session_state['assistants']:
         st.sidebar.subheader("Select an Assistant")
-        assistant_options = [f"{assistant.metadata.get('type', 'Unknown')} - {assistant.name}" for assistant in st.session_state['assistants']]
-        selected_assistant_option = st.sidebar.selectbox("Choose an assistant", assistant_options, key="assistant_select")
-        
-        selected_assistant_name = selected_assistant_option.split(" - ", 1)[1]
-        selected_assistant = next((a for a in st.session_state['assistants'] if a.name == selected_assistant_name), None)
+        selected_assistant_option = st.sidebar.selectbox("Choose an assistant", st.session_state['_assistant_options'], key="assistant_select")
+
+        selected_assistant = st.session_state['_assistant_index'].get(selected_assistant_option)
         
         if selected_assistant:
             st.session_state['assistant'] = selected_assistant
@@ -617,21 +867,48 @@ def main():
             vector_store_id = get_assistant_vector_store_id(selected_assistant)
             
             if vector_store_id:
-                st.session_state['vector_store'] = client.beta.vector_stores.retrieve(vector_store_id)
+                st.session_state['vector_store'] = get_vector_store(vector_store_id)
 
                 # Display Vector Store Files in a dropdown
                 with st.sidebar.expander("Vector Store Files", expanded=False):
-                    files = list_vector_store_files(vector_store_id)
-                    if files:
-                        for file_id, file_info in files:
-                            col1, col2 = st.columns([3, 1])
-                            col1.text(file_info)
-                            if col2.button('Delete', key=f'delete_{file_id}'):
-                                if delete_vector_store_file(vector_store_id, file_id):
-                                    st.success(f'File deleted successfully!')
-                                    st.rerun()
-                    else:
-                        st.text('No files in the vector store')
+                    # A collapsed expander still executes its body on every
+                    # rerun, so only fetch and render the listing on request
+                    if st.checkbox("Show files", key="show_files"):
+                        files = cached_vector_store_files(vector_store_id, st.session_state['refresh_files'])
+                        if files:
+                            # One form with checkboxes instead of a button per
+                            # file; selected files are deleted concurrently
+                            with st.form("delete_files_form"):
+                                for file_id, file_info in files:
+                                    st.checkbox(file_info, key=f'sel_{file_id}')
+                                if st.form_submit_button("Delete selected"):
+                                    selected = [fid for fid, _ in files if st.session_state.get(f'sel_{fid}')]
+                                    if selected:
+                                        with ThreadPoolExecutor(max_workers=min(8, len(selected))) as executor:
+                                            results = list(executor.map(
+                                                lambda fid: delete_vector_store_file(vector_store_id, fid), selected
+                                            ))
+                                        deleted = sum(1 for r in results if r)
+                                        failed = len(selected) - deleted
+                                        if deleted:
+                                            st.session_state['refresh_files'] += 1
+                                            invalidate_vector_store(vector_store_id)
+                                        if failed:
+                                            # Report worker failures from the
+                                            # main thread (st.error is a no-op
+                                            # without a ScriptRunContext) and
+                                            # skip the rerun so it stays visible
+                                            st.error(f'Failed to delete {failed} file(s); see the logs for details.')
+                                        elif deleted:
+                                            st.success(f'Deleted {deleted} file(s) successfully!')
+                                            # The listing and checkboxes above
+                                            # were rendered before this branch
+                                            # ran, so redraw with the fresh data
+                                            st.rerun()
+                                    else:
+                                        st.warning('Please select files to delete.')
+                        else:
+                            st.text('No files in the vector store')
 
                 # Add the upload additional files function to the sidebar
                 upload_additional_files(vector_store_id)